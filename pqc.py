@@ -21,10 +21,22 @@ This notebook implements a simulation framework for fault-tolerant topological p
 The notebook includes detailed code and analysis of numerical outputs and plots.
 """
 
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
 import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
 import qutip as qt
 import matplotlib.pyplot as plt
 
+try:
+    import numba
+except ImportError:  # optional: the pure-NumPy paths below are used instead
+    numba = None
+
 plt.style.use('ggplot')
 np.random.seed(42)
 
@@ -33,11 +45,20 @@ np.random.seed(42)
 We model each lattice site as a two-level system (representing vacuum and one excitation). The following functions construct operators acting on individual sites in the full Hilbert space (which is the tensor product of each site’s 2-dimensional space).
 """
 
+@functools.lru_cache(maxsize=None)
+def _operator_on_site_cached(op_bytes, i, N):
+    op_mat = sp.csr_matrix(np.frombuffer(op_bytes, dtype=complex).reshape(2, 2))
+    mat = sp.kron(sp.identity(2**i, format='csr'),
+                  sp.kron(op_mat, sp.identity(2**(N-1-i), format='csr'), format='csr'),
+                  format='csr')
+    return qt.Qobj(mat, dims=[[2]*N, [2]*N])
+
 def operator_on_site(op, i, N):
-    """Constructs an operator acting as 'op' on site i in an N-site tensor product space."""
-    op_list = [qt.qeye(2) for _ in range(N)]
-    op_list[i] = op
-    return qt.tensor(op_list)
+    """Constructs an operator acting as 'op' on site i in an N-site tensor product space (CSR-backed).
+
+    The Kronecker chain is deterministic in (op, i, N), so results are memoized
+    on the operator's matrix elements."""
+    return _operator_on_site_cached(op.full().astype(complex).tobytes(), i, N)
 
 def destroy_site(i, N):
     """Returns the annihilation (lowering) operator on site i."""
@@ -49,42 +70,79 @@ def create_site(i, N):
 
 """## 2. SSH Hamiltonian and Inverse Participation Ratio (IPR)
 
-Here, we construct the SSH Hamiltonian for an N-site lattice. The Hamiltonian incorporates disorder in the hopping amplitudes (with up to 30% variation). We then diagonalize the Hamiltonian, filter eigenstates that lie in the single-excitation manifold, and compute the IPR for each eigenstate to quantify localization.
+Here, we construct the SSH Hamiltonian for an N-site lattice directly in the N-dimensional single-excitation subspace (the physics of a single photon never leaves this manifold, so the full 2^N space is only needed when coupling to the noise model later on). The Hamiltonian incorporates disorder in the hopping amplitudes (with up to 30% variation). We then diagonalize it and compute the IPR for each eigenstate to quantify localization.
 
 **IPR Analysis:** Lower IPR values indicate more delocalized states, whereas higher IPR values signal stronger localization (typical for edge states in the topological phase).
 """
 
-def ssh_hamiltonian_extended(N, t1, t2, disorder=0.0):
-    """Constructs the SSH Hamiltonian for an N-site lattice. Each site is a two-level system."""
-    H = 0
-    for i in range(N-1):
-        base_t = t1 if (i % 2 == 0) else t2
-        t_val = base_t * (1 + disorder*(np.random.rand() - 0.5))
-        H += t_val * (create_site(i, N) * destroy_site(i+1, N))
-        H += np.conjugate(t_val) * (create_site(i+1, N) * destroy_site(i, N))
-    return H
-
-def compute_single_excitation_eigensystem(H, N):
-    """Diagonalizes H and filters eigenstates in the single-excitation manifold."""
-    total_excitation = sum(operator_on_site(qt.num(2), i, N) for i in range(N))
-    evals, evecs = H.eigenstates()
-    single_ex_evals = []
-    single_ex_evecs = []
-    for e, psi in zip(evals, evecs):
-        n_exp = qt.expect(total_excitation, psi)
-        if abs(n_exp - 1.0) < 1e-5:
-            single_ex_evals.append(e)
-            single_ex_evecs.append(psi)
-    return np.array(single_ex_evals), single_ex_evecs
-
-def compute_ipr(psi, N):
-    """Computes the inverse participation ratio (IPR) for a single-excitation state."""
-    ipr = 0
+def ssh_hamiltonian_extended(N, t1, t2, disorder=0.0, rng=None):
+    """Constructs the SSH Hamiltonian restricted to the N-dim single-excitation subspace."""
+    rng = np.random if rng is None else rng
+    bases = np.where(np.arange(N-1) % 2 == 0, t1, t2)
+    ts = (bases * (1 + disorder*(rng.rand(N-1) - 0.5))).astype(complex)
+    return np.diag(ts, 1) + np.diag(np.conjugate(ts), -1)
+
+def compute_single_excitation_eigensystem(H):
+    """Diagonalizes the single-excitation Hamiltonian; every eigenstate lies in the manifold by construction."""
+    evals, evecs = np.linalg.eigh(H)
+    return evals, [evecs[:, k] for k in range(len(evals))]
+
+def compute_ipr(evecs):
+    """Computes the inverse participation ratio (IPR) for all single-excitation eigenstates at once."""
+    P = np.abs(np.column_stack(evecs))**2
+    return np.einsum('ik,ik->k', P, P)
+
+def one_realization(N, t1, t2, disorder, seed):
+    """Builds one seeded disorder realization, diagonalizes it and returns the eigenstate IPRs."""
+    rng = np.random.RandomState(seed)
+    H = ssh_hamiltonian_extended(N, t1, t2, disorder=disorder, rng=rng)
+    _, evecs = compute_single_excitation_eigensystem(H)
+    return compute_ipr(evecs)
+
+def _ipr_batch(args):
+    N, t1, t2, disorder, seeds = args
+    return [one_realization(N, t1, t2, disorder, s) for s in seeds]
+
+def disorder_averaged_ipr(N, t1, t2, disorder, num_realizations=200, num_workers=None):
+    """Averages eigenstate IPRs over independent disorder realizations in parallel.
+
+    Each realization is sub-ms after the single-excitation rewrite, so seeds are
+    batched per worker to amortize process dispatch."""
+    num_workers = num_workers or (os.cpu_count() or 1)
+    seed_chunks = [c for c in np.array_split(np.arange(num_realizations), num_workers) if len(c)]
+    jobs = [(N, t1, t2, disorder, chunk.tolist()) for chunk in seed_chunks]
+    # fork keeps this notebook-style module usable from workers without re-import
+    with ProcessPoolExecutor(max_workers=len(jobs), mp_context=get_context('fork')) as pool:
+        batches = pool.map(_ipr_batch, jobs)
+    return np.mean([ipr for batch in batches for ipr in batch], axis=0)
+
+def lift_single_excitation_state(vec, N):
+    """Lifts a length-N single-excitation amplitude vector to a ket in the full 2^N space."""
+    ket = 0
     for i in range(N):
-        proj_i = operator_on_site(qt.basis(2,1) * qt.basis(2,1).dag(), i, N)
-        p_i = qt.expect(proj_i, psi)
-        ipr += p_i**2
-    return ipr
+        ket_list = [qt.basis(2, 0)] * N
+        ket_list[i] = qt.basis(2, 1)
+        ket += vec[i] * qt.tensor(ket_list)
+    return ket
+
+def lift_single_excitation_operator(A, N):
+    """Lifts an N x N single-excitation operator (e.g. a density matrix) into the full 2^N space."""
+    cols = []
+    for i in range(N):
+        ket_list = [qt.basis(2, 0)] * N
+        ket_list[i] = qt.basis(2, 1)
+        cols.append(qt.tensor(ket_list).full().ravel())
+    S = np.column_stack(cols)
+    return qt.Qobj(S @ A @ S.conj().T, dims=[[2]*N, [2]*N])
+
+def lift_single_excitation_hamiltonian(H_mat, N):
+    """Rebuilds the full 2^N-space hopping Hamiltonian from the N x N single-excitation matrix."""
+    H_full = 0
+    for i in range(N):
+        for j in range(N):
+            if i != j and H_mat[i, j] != 0:
+                H_full += H_mat[i, j] * (create_site(i, N) * destroy_site(j, N))
+    return H_full
 
 # Parameters
 N = 6
@@ -93,12 +151,17 @@ disorder_strength = 0.3
 
 # Build SSH Hamiltonian, compute eigenstates
 H_ssh = ssh_hamiltonian_extended(N, t1, t2, disorder=disorder_strength)
-evals, evecs = compute_single_excitation_eigensystem(H_ssh, N)
+evals, evecs = compute_single_excitation_eigensystem(H_ssh)
 
 # Compute and display IPR
-ipr_values = [compute_ipr(psi, N) for psi in evecs]
+ipr_values = compute_ipr(evecs)
 print("IPR for single-excitation eigenstates:", np.round(ipr_values, 4))
 
+# Average the IPRs over many independent disorder realizations
+num_realizations = 200
+ipr_avg = disorder_averaged_ipr(N, t1, t2, disorder_strength, num_realizations=num_realizations)
+print(f"Disorder-averaged IPR ({num_realizations} realizations):", np.round(ipr_avg, 4))
+
 # Pick two edge states (lowest absolute energy)
 idx_sort = np.argsort(np.abs(evals))
 edge_state_1 = evecs[idx_sort[0]]
@@ -107,9 +170,7 @@ edge_state_2 = evecs[idx_sort[1]]
 # Plot the probability distributions for the two edge states
 fig, axes = plt.subplots(1, 2, figsize=(12, 4))
 for i, psi_edge in enumerate([edge_state_1, edge_state_2]):
-    probs = [qt.expect(operator_on_site(qt.basis(2,1)*qt.basis(2,1).dag(), s, N), psi_edge)
-             for s in range(N)]
-    axes[i].bar(range(N), probs, color='royalblue')
+    axes[i].bar(range(N), np.abs(psi_edge)**2, color='royalblue')
     axes[i].set_title(f"Edge State {i+1}")
     axes[i].set_xlabel("Site Index")
     axes[i].set_ylabel("Excitation Probability")
@@ -123,85 +184,82 @@ plt.show()
 
 ## 3. Embedded Qubit Operations in the Topologically Protected Subspace
 
-We now embed 2x2 qubit operators into the subspace spanned by the two edge states. This is achieved by constructing a transformation matrix $U$ from the edge state vectors and then embedding any 2x2 operator $A$ as
+We now operate a qubit in the subspace spanned by the two edge states. Since the physical state never leaves span(edge1, edge2), all qubit algebra can be done directly with 2x2 matrices in the edge basis; the transformation matrix $U$ built from the edge state vectors is only needed to lift operators back to the site (and full) space as
 
-$$ A_{\text{embed}} = U A U^\dagger. $$
+$$ A_{\text{site}} = U A U^\dagger, $$
 
-We then perform measurements in both the $z$-basis and the $x$-basis to verify the correct embedding.
+e.g. for the noise model below. We then perform measurements in both the $z$-basis and the $x$-basis to verify the correct embedding.
 """
 
 class EmbeddedQubit:
-    """Embeds 2x2 qubit operators into the subspace spanned by two edge states."""
+    """Works with 2x2 qubit operators directly in the basis spanned by two edge states."""
     def __init__(self, psi_edge1, psi_edge2, N):
-        self.psi_edge1 = psi_edge1
-        self.psi_edge2 = psi_edge2
         self.N = N
-        # Full operator dimensions for a 2^N Hilbert space
-        self.op_dims = [[2]*N, [2]*N]
-
-        # Build transformation matrix U (for N=6, shape will be (64,2))
-        col1 = psi_edge1.full().ravel()
-        col2 = psi_edge2.full().ravel()
-        self.U = np.column_stack((col1, col2))
+        # Frame of the protected subspace: columns are the length-N edge vectors
+        self.U = np.column_stack((psi_edge1, psi_edge2))
 
-    def embed_operator(self, A_2x2):
-        """Embeds a 2x2 operator into the full Hilbert space: A_emb = U * A * U^\dagger."""
-        A2 = A_2x2.full()
-        A_embedded = self.U @ A2 @ self.U.conj().T
-        return qt.Qobj(A_embedded, dims=self.op_dims)
+    def to_site_basis(self, A_2x2):
+        """Expresses a 2x2 edge-basis operator as an N x N single-excitation operator: A_site = U * A * U^\dagger."""
+        return self.U @ A_2x2 @ self.U.conj().T
 
     def measurement_operators(self, basis='z'):
-        """Returns the measurement operators (P0, P1) in the chosen basis, embedded in the full space."""
+        """Returns the 2x2 measurement operators (P0, P1) in the chosen basis, in the edge basis."""
         if basis.lower() == 'z':
-            P0 = 0.5 * (qt.qeye(2) + qt.sigmaz())
-            P1 = 0.5 * (qt.qeye(2) - qt.sigmaz())
+            P0 = 0.5 * (np.eye(2) + qt.sigmaz().full())
+            P1 = 0.5 * (np.eye(2) - qt.sigmaz().full())
         elif basis.lower() == 'x':
-            P0 = 0.5 * (qt.qeye(2) + qt.sigmax())
-            P1 = 0.5 * (qt.qeye(2) - qt.sigmax())
+            P0 = 0.5 * (np.eye(2) + qt.sigmax().full())
+            P1 = 0.5 * (np.eye(2) - qt.sigmax().full())
         else:
             raise ValueError("Unsupported basis. Choose 'z' or 'x'.")
-        return self.embed_operator(P0), self.embed_operator(P1)
+        return P0, P1
 
 def measure_in_subspace(rho, P_plus, P_minus):
-    """Performs a single measurement in the subspace and returns outcome and post-measurement state."""
-    p_plus = (P_plus * rho).tr().real
-    p_minus = (P_minus * rho).tr().real
+    """Performs a single measurement in the edge basis and returns outcome and post-measurement state."""
+    p_plus = np.trace(P_plus @ rho).real
+    p_minus = np.trace(P_minus @ rho).real
     if p_plus + p_minus < 1e-14:
         return 0, rho
     if np.random.rand() < p_plus / (p_plus + p_minus):
-        post_state = (P_plus * rho * P_plus) / p_plus
+        post_state = (P_plus @ rho @ P_plus) / p_plus
         return +1, post_state
     else:
-        post_state = (P_minus * rho * P_minus) / p_minus
+        post_state = (P_minus @ rho @ P_minus) / p_minus
         return -1, post_state
 
 def repeated_measurement(rho, P_plus, P_minus, num_trials=1000):
-    outcomes = []
-    for _ in range(num_trials):
-        outcome, _ = measure_in_subspace(rho, P_plus, P_minus)
-        outcomes.append(outcome)
-    plus_count = sum(o == +1 for o in outcomes)
+    """Tallies measurement outcomes; the state is fixed, so one Binomial draw replaces the trial loop."""
+    p_plus = np.trace(P_plus @ rho).real
+    p_minus = np.trace(P_minus @ rho).real
+    if p_plus + p_minus < 1e-14:
+        return 0, num_trials
+    # clip away tiny negative traces from floating-point roundoff
+    p = min(max(p_plus / (p_plus + p_minus), 0.0), 1.0)
+    plus_count = np.random.binomial(num_trials, p)
     minus_count = num_trials - plus_count
     return plus_count, minus_count
 
-# Instantiate the embedded qubit
+# Instantiate the embedded qubit from the length-N edge vectors
 qubit = EmbeddedQubit(edge_state_1, edge_state_2, N)
 
-# Prepare initial state as edge_state_1
-rho = edge_state_1 * edge_state_1.dag()
+# Prepare initial state as edge_state_1 (|0> in the edge basis); the state stays
+# pure under gates, so track the ket and apply gates as matrix-vector products
+psi_q = np.array([1, 0], dtype=complex)
+
+# Apply an X gate directly in the 2-D edge basis
+X2 = qt.sigmax().full()
+psi_q = X2 @ psi_q
 
-# Apply an X gate in the embedded subspace
-X_gate = qt.sigmax()
-X_embedded = qubit.embed_operator(X_gate)
-rho = X_embedded @ rho @ X_embedded.dag()
+# Form the density matrix only where the measurement statistics need it
+rho_q = np.outer(psi_q, psi_q.conj())
 
 # Perform measurements
 Pz_plus, Pz_minus = qubit.measurement_operators('z')
-plus_z, minus_z = repeated_measurement(rho, Pz_plus, Pz_minus)
+plus_z, minus_z = repeated_measurement(rho_q, Pz_plus, Pz_minus)
 print(f"Z-basis: +1 => {plus_z}, -1 => {minus_z}")
 
 Px_plus, Px_minus = qubit.measurement_operators('x')
-plus_x, minus_x = repeated_measurement(rho, Px_plus, Px_minus)
+plus_x, minus_x = repeated_measurement(rho_q, Px_plus, Px_minus)
 print(f"X-basis: +1 => {plus_x}, -1 => {minus_x}")
 
 """### Analysis of Embedded Qubit Measurements
@@ -216,30 +274,37 @@ We now simulate high-dimensional OAM qudit encoding. The DFT transformation redi
 We analyze the distributions by computing the mean and variance of the OAM mode probabilities.
 """
 
+@functools.lru_cache(maxsize=None)
+def _dft_matrix(dim):
+    # scipy uses the exp(-2i*pi/dim) root; conjugate to keep our exp(+2i*pi/dim) convention
+    return scipy.linalg.dft(dim, scale='sqrtn').conj()
+
+@functools.lru_cache(maxsize=None)
+def _nonlinear_phases(dim, chi):
+    l_vals = np.arange(-dim//2, dim//2)
+    return np.exp(1j * chi * (l_vals**2))
+
 def dft_operator(dim):
-    omega = np.exp(2j * np.pi / dim)
-    F = np.array([[omega**(i*j) for j in range(dim)] for i in range(dim)]) / np.sqrt(dim)
-    return qt.Qobj(F, dims=[[dim], [dim]])
+    return qt.Qobj(_dft_matrix(dim), dims=[[dim], [dim]])
 
 def holographic_oam_gate(state, dim):
-    U_DFT = dft_operator(dim)
-    return U_DFT * state
+    # Applying the DFT via FFT avoids building the dim x dim matrix at all
+    return np.fft.ifft(np.asarray(state).ravel(), norm='ortho')
 
-def combined_nonlinear_interaction(dim, chi):
-    l_vals = np.arange(-dim//2, dim//2)
-    phases = np.exp(1j * chi * (l_vals**2))
-    H_nl = qt.Qobj(np.diag(phases), dims=[[dim], [dim]])
-    U_DFT = dft_operator(dim)
-    return U_DFT * H_nl * U_DFT.dag()
+def apply_nonlinear_interaction(state, dim, chi):
+    """Applies U_DFT diag(phases) U_DFT^dag to the state as FFT -> phase multiply -> IFFT,
+    never forming the dim x dim operator."""
+    psi_l = _nonlinear_phases(dim, chi) * np.fft.fft(np.asarray(state).ravel(), norm='ortho')
+    return np.fft.ifft(psi_l, norm='ortho')
 
 dim_OAM = 8
-psi_oam = qt.rand_ket(dim_OAM)
+psi_oam = qt.rand_ket(dim_OAM).full().ravel()
 
-probs_original = np.abs(psi_oam.full().flatten())**2
+probs_original = np.abs(psi_oam)**2
 print("\nOriginal OAM probabilities:\n", np.round(probs_original, 4))
 
 psi_oam_dft = holographic_oam_gate(psi_oam, dim_OAM)
-probs_dft = np.abs(psi_oam_dft.full().flatten())**2
+probs_dft = np.abs(psi_oam_dft)**2
 print("\nDFT-transformed OAM probabilities:\n", np.round(probs_dft, 4))
 
 # Plot original and DFT-transformed OAM probabilities
@@ -257,9 +322,8 @@ plt.show()
 
 # Nonlinear + DFT
 chi = 0.1
-H_nl_holo = combined_nonlinear_interaction(dim_OAM, chi)
-psi_oam_nl = H_nl_holo * psi_oam
-probs_nl = np.abs(psi_oam_nl.full().flatten())**2
+psi_oam_nl = apply_nonlinear_interaction(psi_oam, dim_OAM, chi)
+probs_nl = np.abs(psi_oam_nl)**2
 print("\nNonlinear + DFT OAM probabilities:\n", np.round(probs_nl, 4))
 
 plt.figure(figsize=(8,5))
@@ -305,8 +369,19 @@ gamma_dephase = 0.05
 L_ops = create_lindblad_operators_extended(N, gamma_damp, gamma_dephase)
 t_list = np.linspace(0, 10, 100)
 
-result = qt.mesolve(H_ssh, rho, t_list, L_ops, [])
-exp_vals = [qt.expect(X_embedded, st) for st in result.states]
+# Lift the evolved qubit state and the X observable into the full space for the noise model
+H_ssh_full = lift_single_excitation_hamiltonian(H_ssh, N)
+rho_full = lift_single_excitation_operator(qubit.to_site_basis(rho_q), N)
+X_embedded = lift_single_excitation_operator(qubit.to_site_basis(X2), N)
+with qt.CoreOptions(default_dtype='csr'):
+    # matrix_form applies H.rho and L.rho.L^dag as n x n matmuls (O(n^3) per step)
+    # instead of building the n^2 x n^2 Liouvillian superoperator (O(n^4));
+    # passing the observable as e_ops accumulates <X> inside the solver, so no
+    # density matrices are retained at all
+    result = qt.mesolve(H_ssh_full, rho_full, t_list, L_ops, e_ops=[X_embedded],
+                        options={"normalize_output": False, "matrix_form": True})
+# the matrix-form path reports Hermitian expectations as complex128; keep the real part
+exp_vals = result.expect[0].real
 
 plt.figure(figsize=(8,5))
 plt.plot(t_list, exp_vals, label="⟨X_embedded⟩")
@@ -337,28 +412,21 @@ def hamiltonian_2D(kx, ky, m):
 
 def berry_curvature(kx_vals, ky_vals, m):
     num_k = len(kx_vals)
-    u = np.empty((num_k, num_k), dtype=object)
-    for i, kx in enumerate(kx_vals):
-        for j, ky in enumerate(ky_vals):
-            H = hamiltonian_2D(kx, ky, m)
-            eigvals, eigvecs = np.linalg.eigh(H)
-            u[i,j] = eigvecs[:, 0]  # lower band
-    Ux = np.zeros((num_k, num_k), dtype=complex)
-    Uy = np.zeros((num_k, num_k), dtype=complex)
-    F = np.zeros((num_k, num_k))
-    for i in range(num_k):
-        for j in range(num_k):
-            ip = (i+1) % num_k
-            jp = (j+1) % num_k
-            Ux[i,j] = np.vdot(u[i,j], u[ip,j])
-            Ux[i,j] /= abs(Ux[i,j])
-            Uy[i,j] = np.vdot(u[i,j], u[i,jp])
-            Uy[i,j] /= abs(Uy[i,j])
-    for i in range(num_k):
-        for j in range(num_k):
-            ip = (i+1) % num_k
-            jp = (j+1) % num_k
-            F[i,j] = np.angle(Ux[i,j]*Uy[ip,j]*np.conjugate(Ux[i,jp])*np.conjugate(Uy[i,j]))
+    # Build H(kx, ky) on the whole grid at once; eigh batches over the leading axes
+    KX, KY = np.meshgrid(kx_vals, ky_vals, indexing='ij')
+    H = np.empty((num_k, num_k, 2, 2), dtype=complex)
+    H[..., 0, 0] = m + np.cos(KX) + np.cos(KY)
+    H[..., 1, 1] = -(m + np.cos(KX) + np.cos(KY))
+    H[..., 0, 1] = np.sin(KX) - 1j*np.sin(KY)
+    H[..., 1, 0] = np.sin(KX) + 1j*np.sin(KY)
+    eigvals, eigvecs = np.linalg.eigh(H)
+    u = eigvecs[..., :, 0]  # lower band, shape (num_k, num_k, 2)
+    # Link variables on the whole grid: np.roll gives the periodically shifted neighbours
+    Ux = np.einsum('ijk,ijk->ij', u.conj(), np.roll(u, -1, axis=0))
+    Ux /= np.abs(Ux)
+    Uy = np.einsum('ijk,ijk->ij', u.conj(), np.roll(u, -1, axis=1))
+    Uy /= np.abs(Uy)
+    F = np.angle(Ux * np.roll(Uy, -1, axis=0) * np.roll(Ux, -1, axis=1).conj() * Uy.conj())
     total_flux = np.sum(F)
     chern = total_flux / (2*np.pi)
     return F, chern
@@ -379,13 +447,53 @@ plt.xlabel("kx")
 plt.ylabel("ky")
 plt.show()
 
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _chern_kernel(m_vals, k_vals):
+        """Chern numbers for all m at once: closed-form lower-band eigenvectors of d.sigma plus plaquette fluxes, parallel over m."""
+        num_m = m_vals.shape[0]
+        num_k = k_vals.shape[0]
+        cherns = np.empty(num_m)
+        for q in numba.prange(num_m):
+            m = m_vals[q]
+            u = np.empty((num_k, num_k, 2), dtype=np.complex128)
+            for i in range(num_k):
+                for j in range(num_k):
+                    dx = np.sin(k_vals[i])
+                    dy = np.sin(k_vals[j])
+                    dz = m + np.cos(k_vals[i]) + np.cos(k_vals[j])
+                    r = np.sqrt(dx*dx + dy*dy + dz*dz)
+                    a = dz - r
+                    nrm = np.sqrt(a*a + dx*dx + dy*dy)
+                    if nrm < 1e-12:
+                        # d along +z: the closed form degenerates; lower band is |1>
+                        u[i, j, 0] = 0.0
+                        u[i, j, 1] = 1.0
+                    else:
+                        u[i, j, 0] = a / nrm
+                        u[i, j, 1] = (dx + 1j*dy) / nrm
+            total_flux = 0.0
+            for i in range(num_k):
+                ip = (i+1) % num_k
+                for j in range(num_k):
+                    jp = (j+1) % num_k
+                    Ux = np.conj(u[i,j,0])*u[ip,j,0] + np.conj(u[i,j,1])*u[ip,j,1]
+                    Uy_r = np.conj(u[ip,j,0])*u[ip,jp,0] + np.conj(u[ip,j,1])*u[ip,jp,1]
+                    Ux_u = np.conj(u[i,jp,0])*u[ip,jp,0] + np.conj(u[i,jp,1])*u[ip,jp,1]
+                    Uy = np.conj(u[i,j,0])*u[i,jp,0] + np.conj(u[i,j,1])*u[i,jp,1]
+                    # normalizing the links only rescales the modulus, so the angle is unchanged
+                    total_flux += np.angle(Ux * Uy_r * np.conj(Ux_u) * np.conj(Uy))
+            cherns[q] = total_flux / (2*np.pi)
+        return cherns
+
 def chern_number_analysis(m_values, num_k=30):
-    chern_nums = []
     k_vals = np.linspace(-np.pi, np.pi, num_k, endpoint=False)
-    for m in m_values:
-        _, c = berry_curvature(k_vals, k_vals, m)
-        chern_nums.append(c)
-    return chern_nums
+    if numba is not None:
+        # the jitted kernel already sweeps m in parallel via prange
+        return list(_chern_kernel(np.asarray(m_values, dtype=float), k_vals))
+    # each m is independent; threads suffice since batched eigh releases the GIL
+    with ThreadPoolExecutor() as pool:
+        return list(pool.map(lambda m: berry_curvature(k_vals, k_vals, m)[1], m_values))
 
 m_vals = np.linspace(-2.5, 0.5, 15)
 chern_nums = chern_number_analysis(m_vals, num_k=num_k)